@@ -0,0 +1,145 @@
+# controls.py
+import gzip
+import struct
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pygame
+from settings import FPS
+
+# Удерживаемые клавиши движения — биты маски held
+HELD_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+# События, которые нужны игре и попадают в запись
+RECORDED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN)
+
+# Формат записи (gzip): заголовок, затем кадры
+#   кадр:    dt float32, held uint8, число событий uint8
+#   событие: тип uint8 + данные (KEYDOWN: key int32; MOUSEBUTTONDOWN: button uint8, x, y int16)
+MAGIC = b'JPLREC'
+VERSION = 1
+_FRAME = struct.Struct('<fBB')
+_KEY = struct.Struct('<i')
+_MOUSE = struct.Struct('<Bhh')
+_EVENT_CODES = {pygame.QUIT: 0, pygame.KEYDOWN: 1, pygame.MOUSEBUTTONDOWN: 2}
+_EVENT_TYPES = {code: event_type for event_type, code in _EVENT_CODES.items()}
+
+
+@dataclass
+class InputState:
+    """Ввод за один кадр: шаг времени, маска удерживаемых клавиш и события."""
+    dt: float
+    held: int = 0
+    events: list[pygame.event.Event] = field(default_factory=list)
+
+
+class InputSource(ABC):
+    """Базовый источник ввода: Game опрашивает его раз в кадр, Player читает held."""
+
+    def __init__(self):
+        self.held = 0
+
+    def is_held(self, key: int) -> bool:
+        """Удерживается ли клавиша движения key в текущем кадре."""
+        return bool(self.held & (1 << HELD_KEYS.index(key)))
+
+    @abstractmethod
+    def poll(self, clock: pygame.time.Clock | None) -> InputState | None:
+        """Ввод следующего кадра; None — ввод закончился (конец записи)."""
+
+    def close(self):
+        pass
+
+
+class LiveInput(InputSource):
+    """Клавиатура и мышь; dt берётся из clock (без clock — фиксированный шаг)."""
+
+    def poll(self, clock):
+        dt = clock.tick(FPS) / 600 if clock else (1000 / FPS) / 600
+        events = [e for e in pygame.event.get() if e.type in RECORDED_EVENTS]
+        keys = pygame.key.get_pressed()
+        self.held = sum(1 << bit for bit, key in enumerate(HELD_KEYS) if keys[key])
+        return InputState(dt, self.held, events)
+
+
+class InputRecorder(InputSource):
+    """Пропускает ввод другого источника и пишет каждый кадр в файл."""
+
+    def __init__(self, source: InputSource, path: str | Path):
+        super().__init__()
+        self.source = source
+        self.file = gzip.open(path, 'wb')
+        self.file.write(MAGIC + bytes([VERSION]))
+        self.frames = 0
+
+    def poll(self, clock):
+        state = self.source.poll(clock)
+        if state is not None:
+            self.held = state.held
+            self.write(state)
+        return state
+
+    def write(self, state: InputState):
+        """Записать один кадр."""
+        self.file.write(_FRAME.pack(state.dt, state.held, len(state.events)))
+        for event in state.events:
+            self.file.write(bytes([_EVENT_CODES[event.type]]))
+            if event.type == pygame.KEYDOWN:
+                self.file.write(_KEY.pack(event.key))
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                self.file.write(_MOUSE.pack(event.button, *event.pos))
+        self.frames += 1
+
+    def close(self):
+        self.file.close()
+        self.source.close()
+
+
+class ReplayInput(InputSource):
+    """Воспроизводит запись кадр за кадром с записанными dt.
+
+    С clock (обычный запуск) кадры идут в темпе FPS; без clock — так быстро,
+    как позволяет Game.update (fast-forward). Закрытие окна прерывает воспроизведение.
+    """
+
+    def __init__(self, path: str | Path):
+        super().__init__()
+        self.file = gzip.open(path, 'rb')
+        header = self.file.read(len(MAGIC) + 1)
+        if header[:len(MAGIC)] != MAGIC or header[-1] != VERSION:
+            raise ValueError(f"{path} is not a JourneyPL input recording")
+        self.frames = 0
+
+    def _read(self, fmt: struct.Struct) -> tuple:
+        data = self.file.read(fmt.size)
+        if len(data) < fmt.size:
+            raise EOFError
+        return fmt.unpack(data)
+
+    def poll(self, clock):
+        if clock:
+            clock.tick(FPS)
+        # Живые события окна в игру не идут (кроме закрытия окна — оно останавливает запись)
+        if any(event.type == pygame.QUIT for event in pygame.event.get()):
+            return None
+        try:
+            dt, held, count = self._read(_FRAME)
+            events = []
+            for _ in range(count):
+                event_type = _EVENT_TYPES[self.file.read(1)[0]]
+                if event_type == pygame.KEYDOWN:
+                    (key,) = self._read(_KEY)
+                    events.append(pygame.event.Event(event_type, key=key))
+                elif event_type == pygame.MOUSEBUTTONDOWN:
+                    button, x, y = self._read(_MOUSE)
+                    events.append(pygame.event.Event(event_type, button=button, pos=(x, y)))
+                else:
+                    events.append(pygame.event.Event(event_type))
+        except (EOFError, IndexError):
+            return None
+        self.held = held
+        self.frames += 1
+        return InputState(dt, held, events)
+
+    def close(self):
+        self.file.close()
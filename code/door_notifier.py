@@ -17,12 +17,17 @@ class DoorNotifier:
         self.start_time = 0
         self.image = None
         self.rect = None
+        # Плавное затухание (QualityGovernor может отключить)
+        self.fade = True
+        self.banner = None
 
     def show(self):
         """Запустить показ баннера двери."""
         banner_path = UI_DIR / "door_banner.png"
-        img = ResourceManager.load_image(banner_path)
-        self.image = img.convert_alpha()
+        # собственная копия баннера, берётся один раз (альфа меняется при затухании)
+        if self.banner is None:
+            self.banner = ResourceManager.load_image(banner_path).copy()
+        self.image = self.banner
         self.image.set_alpha(255)  # начальная непрозрачность
         self.rect = self.image.get_rect(midbottom=(WINDOW_WIDTH // 2, WINDOW_HEIGHT * 0.95))
         self.start_time = pygame.time.get_ticks()
@@ -36,7 +41,7 @@ class DoorNotifier:
         if elapsed >= self.DISPLAY_TIME:
             # Баннер полностью скрывается по истечении времени
             self.active = False
-        elif elapsed > self.FADE_DELAY:
+        elif self.fade and elapsed > self.FADE_DELAY:
             # Начинаем затухание
             fade_elapsed = elapsed - self.FADE_DELAY
             alpha = int(255 * (1 - fade_elapsed / self.FADE_TIME))
@@ -1,6 +1,9 @@
 # groups.py
+from collections import OrderedDict
+import math
 import pygame
-from settings import WINDOW_WIDTH, WINDOW_HEIGHT
+from resource_manager import ResourceManager
+from settings import WINDOW_WIDTH, WINDOW_HEIGHT, ZOOM_LEVELS, CHUNK_SIZE, CHUNK_CACHE_PIXELS
 
 
 class CameraGroup(pygame.sprite.Group):
@@ -8,7 +11,7 @@ class CameraGroup(pygame.sprite.Group):
         super().__init__()
         # Основна поверхня для відмалювання
         self.display_surface = pygame.display.get_surface()
-        # Вектор зсуву камери
+        # Вектор зсуву камери (світові координати лівого верхнього кута екрана)
         self.offset = pygame.math.Vector2()
         # Піврозміри екрана для обчислень центру
         self.half_w = self.display_surface.get_width() // 2
@@ -17,7 +20,25 @@ class CameraGroup(pygame.sprite.Group):
         self.target = None
         # Список шарів для паралаксу: [(surface, speed), ...]
         self.parallax_layers = []
+        # Кеш попередньо замощених поверхонь шарів: (surface, render_scale) -> tiled (екран + одна плитка)
+        self._parallax_tiled: dict[tuple[pygame.Surface, float], pygame.Surface] = {}
 
+        # Масштаб камери — один із ZOOM_LEVELS
+        self.zoom = 1.0
+        # Масштаб рендерингу світу (знижується QualityGovernor): світ малюється
+        # у меншу поверхню, яку present() розтягує на екран
+        self.render_scale = 1.0
+        self._lowres = None
+        # Куди і з яким фактичним масштабом намальовано світ в останньому draw()
+        self.surface = self.display_surface
+        self.view_zoom = 1.0
+        # Ground-спрайти по чанках: (cx, cy) -> [sprite, ...]; None — треба перебудувати
+        self._ground_chunks = None
+        # LRU-кеш відмальованих чанків: (zoom, cx, cy) -> Surface
+        self._chunk_cache: "OrderedDict[tuple[float, int, int], pygame.Surface]" = OrderedDict()
+        self._chunk_pixels = 0
+        # Не-ground спрайти: лише їх потрібно оновлювати й сортувати щокадру
+        self._dynamic: dict[pygame.sprite.Sprite, None] = {}
 
     def set_target(self, sprite: pygame.sprite.Sprite) -> None:
         """Встановлює, за чим слідкуватиме камера."""
@@ -27,6 +48,45 @@ class CameraGroup(pygame.sprite.Group):
         """Додає фон з власною швидкістю зсуву для паралаксу."""
         self.parallax_layers.append((surface, speed))
 
+    def set_zoom(self, zoom: float) -> None:
+        """Встановлює масштаб (найближчий із ZOOM_LEVELS)."""
+        self.zoom = min(ZOOM_LEVELS, key=lambda level: abs(level - zoom))
+
+    def zoom_in(self) -> None:
+        """Наступний більший рівень масштабу."""
+        index = ZOOM_LEVELS.index(self.zoom)
+        self.zoom = ZOOM_LEVELS[min(index + 1, len(ZOOM_LEVELS) - 1)]
+
+    def zoom_out(self) -> None:
+        """Наступний менший рівень масштабу."""
+        index = ZOOM_LEVELS.index(self.zoom)
+        self.zoom = ZOOM_LEVELS[max(index - 1, 0)]
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        if getattr(sprite, "ground", False):
+            self._invalidate_chunks()
+        else:
+            self._dynamic[sprite] = None
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        if getattr(sprite, "ground", False):
+            self._invalidate_chunks()
+        else:
+            self._dynamic.pop(sprite, None)
+
+    def update(self, *args, **kwargs):
+        """Оновлює лише не-ground спрайти: фонові тайли статичні."""
+        for sprite in list(self._dynamic):
+            sprite.update(*args, **kwargs)
+
+    def _invalidate_chunks(self) -> None:
+        """Фонові спрайти змінилися — чанки треба перемалювати."""
+        self._ground_chunks = None
+        self._chunk_cache.clear()
+        self._chunk_pixels = 0
+
     def _calculate_offset(self) -> None:
         """Оновлює self.offset на основі позиції target."""
         if not self.target:
@@ -34,29 +94,142 @@ class CameraGroup(pygame.sprite.Group):
         self.offset.x = -(self.target.rect.centerx - self.half_w)
         self.offset.y = -(self.target.rect.centery - self.half_h)
 
+    def _get_parallax_tiled(self, surface: pygame.Surface) -> pygame.Surface:
+        """Замощена поверхня шару під render_scale: покриває буфер світу з будь-яким зсувом у межах однієї плитки."""
+        key = (surface, self.render_scale)
+        tiled = self._parallax_tiled.get(key)
+        if tiled is None:
+            if self.render_scale != 1:
+                # Плитка зменшується разом з буфером, щоб після present() фон мав той самий вигляд
+                w, h = surface.get_size()
+                surface = ResourceManager.get_variant(
+                    surface, size=(max(1, round(w * self.render_scale)), max(1, round(h * self.render_scale)))
+                )
+            tile_w, tile_h = surface.get_size()
+            cols = math.ceil(self.surface.get_width() / tile_w) + 1
+            rows = math.ceil(self.surface.get_height() / tile_h) + 1
+            tiled = pygame.Surface((cols * tile_w, rows * tile_h), surface.get_flags(), surface)
+            if surface.get_flags() & pygame.SRCALPHA:
+                tiled = tiled.convert_alpha()
+                tiled.fill((0, 0, 0, 0))
+            else:
+                tiled = tiled.convert()
+            tiled.blits(
+                [(surface, (col * tile_w, row * tile_h)) for row in range(rows) for col in range(cols)],
+                doreturn=False
+            )
+            self._parallax_tiled[key] = tiled
+        return tiled
+
+    def _draw_parallax(self) -> None:
+        """Кожен шар — один blit потрібної ділянки замощеної поверхні, зсунутої на offset * speed."""
+        screen_w, screen_h = self.surface.get_size()
+        for surface, speed in self.parallax_layers:
+            tiled = self._get_parallax_tiled(surface)
+            tile_w = round(surface.get_width() * self.render_scale) or 1
+            tile_h = round(surface.get_height() * self.render_scale) or 1
+            # Зсув у пікселях буфера світу, у межах однієї плитки — далі візерунок повторюється
+            shift_x = int(self.offset.x * speed * self.render_scale) % tile_w
+            shift_y = int(self.offset.y * speed * self.render_scale) % tile_h
+            self.surface.blit(tiled, (0, 0), (shift_x, shift_y, screen_w, screen_h))
+
+    def _build_ground_chunks(self) -> None:
+        """Розкладає ground-спрайти по чанках CHUNK_SIZE x CHUNK_SIZE."""
+        chunks = {}
+        for sprite in self.sprites():
+            if not getattr(sprite, "ground", False):
+                continue
+            rect = sprite.rect
+            for cx in range(rect.left // CHUNK_SIZE, (rect.right - 1) // CHUNK_SIZE + 1):
+                for cy in range(rect.top // CHUNK_SIZE, (rect.bottom - 1) // CHUNK_SIZE + 1):
+                    chunks.setdefault((cx, cy), []).append(sprite)
+        self._ground_chunks = chunks
+
+    def _get_chunk(self, zoom: float, cx: int, cy: int) -> pygame.Surface | None:
+        """Чанк фону для масштабу zoom: з кешу або відмальовується ліниво."""
+        key = (zoom, cx, cy)
+        chunk = self._chunk_cache.get(key)
+        if chunk is not None:
+            self._chunk_cache.move_to_end(key)
+            return chunk
+
+        sprites = self._ground_chunks.get((cx, cy))
+        if not sprites:
+            return None
+        origin = (cx * CHUNK_SIZE, cy * CHUNK_SIZE)
+        chunk = pygame.Surface((CHUNK_SIZE, CHUNK_SIZE), pygame.SRCALPHA).convert_alpha()
+        chunk.fill((0, 0, 0, 0))
+        for sprite in sprites:
+            chunk.blit(sprite.image, (sprite.rect.x - origin[0], sprite.rect.y - origin[1]))
+        if zoom != 1:
+            size = round(CHUNK_SIZE * zoom)
+            chunk = pygame.transform.scale(chunk, (size, size))
+
+        self._chunk_cache[key] = chunk
+        self._chunk_pixels += chunk.get_width() * chunk.get_height()
+        # Витісняємо найдавніше використані чанки (зазвичай — інших рівнів zoom)
+        while self._chunk_pixels > CHUNK_CACHE_PIXELS and len(self._chunk_cache) > 1:
+            _, old = self._chunk_cache.popitem(last=False)
+            self._chunk_pixels -= old.get_width() * old.get_height()
+        return chunk
+
+    def _get_surface(self) -> pygame.Surface:
+        """Поверхня для світу: екран або зменшений буфер під render_scale."""
+        if self.render_scale == 1:
+            return self.display_surface
+        size = (
+            round(self.display_surface.get_width() * self.render_scale),
+            round(self.display_surface.get_height() * self.render_scale),
+        )
+        if self._lowres is None or self._lowres.get_size() != size:
+            self._lowres = pygame.Surface(size).convert()
+        self._lowres.fill('black')
+        return self._lowres
+
+    def present(self) -> None:
+        """Розтягує зменшений буфер світу на екран (нічого не робить при render_scale 1)."""
+        if self.surface is not self.display_surface:
+            pygame.transform.scale(self.surface, self.display_surface.get_size(), self.display_surface)
+
     def draw(self, player):
+        # Фактичний масштаб: zoom камери з урахуванням render_scale
+        self.surface = surface = self._get_surface()
+        self.view_zoom = zoom = self.zoom * self.render_scale
         # Обновляем смещение камеры по позиции игрока
-        self.offset.x = player.rect.centerx - self.half_w
-        self.offset.y = player.rect.centery - self.half_h
+        self.offset.x = player.rect.centerx - surface.get_width() / 2 / zoom
+        self.offset.y = player.rect.centery - surface.get_height() / 2 / zoom
+        # Экранная позиция мировой точки: (world - offset) * zoom.
+        # Начало координат округляем один раз, чтобы между чанками не было щелей
+        origin_x = round(-self.offset.x * zoom)
+        origin_y = round(-self.offset.y * zoom)
 
-        # Собираем списки ground-спрайтов и остальных
-        ground_sprites = []
-        other_sprites = []
-        for sprite in self.sprites():
-            if getattr(sprite, "ground", False):
-                ground_sprites.append(sprite)
-            else:
-                other_sprites.append(sprite)
+        # Паралакс-фон під світом
+        self._draw_parallax()
 
-        # Рисуем сначала «земные» спрайты без сортировки (фоновые)
-        for sprite in ground_sprites:
-            offset_pos = sprite.rect.topleft - self.offset
-            self.display_surface.blit(sprite.image, offset_pos)
+        # Фон — из заранее отрисованных чанков текущего масштаба
+        if self._ground_chunks is None:
+            self._build_ground_chunks()
+        view_w = surface.get_width() / zoom
+        view_h = surface.get_height() / zoom
+        scaled_chunk = round(CHUNK_SIZE * zoom)
+        for cx in range(math.floor(self.offset.x / CHUNK_SIZE),
+                        math.floor((self.offset.x + view_w) / CHUNK_SIZE) + 1):
+            for cy in range(math.floor(self.offset.y / CHUNK_SIZE),
+                            math.floor((self.offset.y + view_h) / CHUNK_SIZE) + 1):
+                chunk = self._get_chunk(zoom, cx, cy)
+                if chunk is not None:
+                    surface.blit(
+                        chunk, (origin_x + cx * scaled_chunk, origin_y + cy * scaled_chunk)
+                    )
 
         # Сортируем остальные спрайты по rect.bottom и рисуем
-        for sprite in sorted(other_sprites, key=lambda s: s.rect.bottom):
-            offset_pos = sprite.rect.topleft - self.offset
-            self.display_surface.blit(sprite.image, offset_pos)
-
-        # Если нужно, можно обновлять и self.lostsprites, но при простом выводе
-        # достаточно вызывать blit, как показано выше.
+        for sprite in sorted(self._dynamic, key=lambda s: s.rect.bottom):
+            if zoom == 1:
+                surface.blit(sprite.image, sprite.rect.topleft - self.offset)
+                continue
+            # Масштабовані кадри кешуються в ResourceManager
+            w, h = sprite.image.get_size()
+            image = ResourceManager.get_variant(sprite.image, size=(round(w * zoom), round(h * zoom)))
+            surface.blit(
+                image, (origin_x + round(sprite.rect.x * zoom), origin_y + round(sprite.rect.y * zoom))
+            )
@@ -2,79 +2,110 @@
 
 import math
 import pygame
-import pygame.surfarray as surfarray
-import numpy as np
 import re
+from pathlib import Path
+from typing import Union
 from settings import *
 from resource_manager import ResourceManager
 
-# === Sticker slot positions (adjust as needed) ===
-sticker_1_x, sticker_1_y = 390, 160
-sticker_2_x, sticker_2_y = 790, 160
-sticker_3_x, sticker_3_y = 500, 250
-sticker_4_x, sticker_4_y = 660, 240
-sticker_5_x, sticker_5_y = 390, 360
-sticker_6_x, sticker_6_y = 790, 360
-sticker_7_x, sticker_7_y = 500, 440
-sticker_8_x, sticker_8_y = 675, 440
+# === Sticker slot layout: (x, y, rotation angle) per slot on a page ===
+# One page holds len(SLOT_LAYOUT) items; edit this table to change the book layout.
+SLOT_LAYOUT = [
+    (390, 160, 24),
+    (790, 160, -12),
+    (500, 250, -34),
+    (660, 240, 22),
+    (390, 360, -40),
+    (790, 360, -35),
+    (500, 440, 25),
+    (675, 440, -35),
+]
 
 
 class InventoryItem:
-    """Element of the inventory: holds color/gray image and picked state."""
+    """Element of the inventory: image source, picked state and lazily loaded surfaces."""
 
-    def __init__(self, item_id: str, image: pygame.Surface):
+    def __init__(self, item_id: str, image: Union[str, Path, pygame.Surface], room: str | None = None):
         base_id = Inventory.normalize_item_id(item_id)
         self.id = base_id
-        self.orig_image = image
-        self.gray_image = self._create_gray(image)
+        self.room = room
         self.picked = False
+        # A path is loaded on demand; a ready Surface is kept for the item's lifetime
+        self.source = None if isinstance(image, pygame.Surface) else image
+        self.orig_image = image if isinstance(image, pygame.Surface) else None
+        self.gray_image = None
 
-    @staticmethod
-    def _create_gray(image: pygame.Surface) -> pygame.Surface:
-        """Create a grayscale copy of the image."""
-        arr = surfarray.array3d(image)
-        lum = (
-            arr[:, :, 0] * 0.3 +
-            arr[:, :, 1] * 0.59 +
-            arr[:, :, 2] * 0.11
-        ).astype(np.uint8)
-        gray_arr = np.stack((lum,) * 3, axis=2)
-        gray_surf = surfarray.make_surface(gray_arr)
-        return gray_surf.convert_alpha()
+    @property
+    def loaded(self) -> bool:
+        return self.orig_image is not None
+
+    def load(self):
+        """Materialize the color and gray surfaces."""
+        if self.orig_image is None:
+            self.orig_image = ResourceManager.acquire_image(self.source)
+        if self.gray_image is None:
+            self.gray_image = ResourceManager.get_variant(self.orig_image, grayscale=True)
+
+    def unload(self):
+        """Drop surfaces of path-backed items so they can be freed."""
+        if self.source is None:
+            return
+        if self.orig_image is not None:
+            ResourceManager.release_image(self.source)
+        self.orig_image = None
+        self.gray_image = None
 
     def get_display_image(self) -> pygame.Surface:
         """Return colored image if picked, otherwise gray."""
+        self.load()
         return self.orig_image if self.picked else self.gray_image
 
 
 class Inventory:
-    """Inventory: stores InventoryItems, handles pagination and rendering."""
+    """Inventory: stores InventoryItems, handles filtering, pagination and rendering."""
 
-    ITEMS_PER_PAGE = 8
     ROTATION_ANGLE = 45
     ARROW_SIZE = 32
+    # Pages around the current one whose item surfaces stay loaded
+    PRELOAD_PAGES = 1
+    # Collected filter cycled with Tab: all -> collected -> missing
+    COLLECTED_FILTERS = (None, True, False)
 
-    def __init__(self):
+    def __init__(self, slot_layout: list[tuple[int, int, float]] = SLOT_LAYOUT):
         # Load and scale background
-        self.bg = ResourceManager.load_image(UI_DIR / 'inventory_book.png')
-        self.bg = pygame.transform.scale(self.bg, (600, 500))
+        self.bg = ResourceManager.get_variant(UI_DIR / 'inventory_book.png', size=(600, 500))
         self.bg_rect = self.bg.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
 
+        # Slot layout: (x, y, angle) for each item on a page
+        self.slot_layout = slot_layout
+        self.items_per_page = len(slot_layout)
+
         # State
         self.is_open = False
         self.items: dict[str, InventoryItem] = {}
         self.items_order: list[str] = []
         self.current_page = 0
 
+        # Indexes for filtering: registration order, collected ids, ids per room
+        self._order_index: dict[str, int] = {}
+        self._collected: set[str] = set()
+        self._by_room: dict[str, set[str]] = {}
+        # Active filters and the filtered, ordered view they produce
+        self.filter_collected: bool | None = None
+        self.filter_room: str | None = None
+        self._view: list[str] = self.items_order
+        self._view_dirty = False
+        # Ids whose surfaces are currently materialized
+        self._loaded: set[str] = set()
+
         # Open/close sound
         audio_path = AUDIO_DIR / 'inventory_open.mp3'
         self.sound = pygame.mixer.Sound(str(audio_path))
 
         # Arrow buttons
-        self.btn_prev = ResourceManager.load_image(UI_DIR / 'arrow_book_left.png').convert_alpha()
-        self.btn_next = ResourceManager.load_image(UI_DIR / 'arrow_book_right.png').convert_alpha()
-        self.btn_prev = pygame.transform.scale(self.btn_prev, (self.ARROW_SIZE, self.ARROW_SIZE))
-        self.btn_next = pygame.transform.scale(self.btn_next, (self.ARROW_SIZE, self.ARROW_SIZE))
+        arrow_size = (self.ARROW_SIZE, self.ARROW_SIZE)
+        self.btn_prev = ResourceManager.get_variant(UI_DIR / 'arrow_book_left.png', size=arrow_size)
+        self.btn_next = ResourceManager.get_variant(UI_DIR / 'arrow_book_right.png', size=arrow_size)
 
         # Position arrows at book corners
         margin = 20
@@ -89,44 +120,136 @@ class Inventory:
         """Open or close the inventory, play sound."""
         self.is_open = not self.is_open
         self.sound.play()
+        if self.is_open:
+            self._sync_loaded()
 
     @staticmethod
     def normalize_item_id(item_id: str) -> str:
         """Strip size suffix (_WIDTHxHEIGHT) from item_id."""
         return re.sub(r'_\d+x\d+$', '', item_id)
 
-    def register_item(self, item_id: str, image: pygame.Surface):
-        """Add a new slot (gray by default) for this item_id."""
+    def register_item(self, item_id: str, image: Union[str, Path, pygame.Surface], room: str | None = None):
+        """Add a new slot (gray by default) for this item_id.
+
+        Pass a path (relative to the project root) so the surfaces are only
+        loaded while the item's page is near the current one.
+        """
         base_id = Inventory.normalize_item_id(item_id)
         if base_id in self.items:
             return
-        item = InventoryItem(base_id, image)
+        item = InventoryItem(base_id, image, room)
         self.items[base_id] = item
+        self._order_index[base_id] = len(self.items_order)
         self.items_order.append(base_id)
+        if room is not None:
+            self._by_room.setdefault(room, set()).add(base_id)
+        if self.filter_collected is not None or self.filter_room is not None:
+            self._view_dirty = True
+
+    def set_item_room(self, item_id: str, room: str):
+        """Record which room an item is placed in (used by the room filter)."""
+        base_id = Inventory.normalize_item_id(item_id)
+        item = self.items.get(base_id)
+        if item is None or item.room == room:
+            return
+        if item.room is not None:
+            self._by_room[item.room].discard(base_id)
+        item.room = room
+        self._by_room.setdefault(room, set()).add(base_id)
+        if self.filter_room is not None:
+            self._view_dirty = True
 
     def pickup_item(self, item_id: str):
         """Mark an item as picked (colorful) when collected."""
         base_id = Inventory.normalize_item_id(item_id)
         if base_id in self.items:
             self.items[base_id].picked = True
+            self._collected.add(base_id)
+            if self.filter_collected is not None:
+                self._view_dirty = True
+
+    def is_collected(self, item_id: str) -> bool:
+        """True if the item has been picked up."""
+        return Inventory.normalize_item_id(item_id) in self._collected
+
+    def set_filter(self, collected: bool | None = None, room: str | None = None):
+        """Show only collected (True) / missing (False) items and/or one room; None means any."""
+        self.filter_collected = collected
+        self.filter_room = room
+        self._view_dirty = True
+        self.current_page = 0
+        if self.is_open:
+            self._sync_loaded()
+
+    @property
+    def view(self) -> list[str]:
+        """Item ids matching the active filters, in registration order."""
+        if self._view_dirty:
+            self._refresh_view()
+            # The page contents may have changed under an open book
+            if self.is_open:
+                self._sync_loaded()
+        return self._view
+
+    def _refresh_view(self):
+        """Rebuild the filtered view and keep the current page within it."""
+        self._view = self._build_view()
+        self._view_dirty = False
+        self.current_page = min(self.current_page, max(self.num_pages - 1, 0))
+
+    def _build_view(self) -> list[str]:
+        if self.filter_collected is None and self.filter_room is None:
+            return self.items_order
+        if self.filter_room is not None:
+            ids = self._by_room.get(self.filter_room, set())
+            if self.filter_collected is True:
+                ids = ids & self._collected
+            elif self.filter_collected is False:
+                ids = ids - self._collected
+        elif self.filter_collected:
+            ids = self._collected
+        else:
+            ids = self.items.keys() - self._collected
+        return sorted(ids, key=self._order_index.__getitem__)
 
     @property
     def num_pages(self) -> int:
         """Total number of pages needed."""
-        return math.ceil(len(self.items_order) / Inventory.ITEMS_PER_PAGE)
+        return math.ceil(len(self.view) / self.items_per_page)
+
+    def page_ids(self, page: int) -> list[str]:
+        """Item ids shown on the given page."""
+        start = page * self.items_per_page
+        return self.view[start : start + self.items_per_page]
+
+    def _sync_loaded(self):
+        """Load surfaces for the current and adjacent pages, release the rest."""
+        if self._view_dirty:
+            self._refresh_view()
+        wanted = set()
+        for page in range(self.current_page - self.PRELOAD_PAGES, self.current_page + self.PRELOAD_PAGES + 1):
+            if page >= 0:
+                wanted.update(self.page_ids(page))
+        for item_id in self._loaded - wanted:
+            self.items[item_id].unload()
+        for item_id in wanted - self._loaded:
+            self.items[item_id].load()
+        self._loaded = wanted
 
     def next_page(self):
         """Go to next page, if any."""
         if self.current_page < self.num_pages - 1:
             self.current_page += 1
+            self._sync_loaded()
 
     def prev_page(self):
         """Go to previous page, if any."""
         if self.current_page > 0:
             self.current_page -= 1
+            self._sync_loaded()
 
     def handle_event(self, event: pygame.event.Event):
-        """Respond to left-clicks on arrow buttons to flip pages."""
+        """Respond to left-clicks on arrow buttons to flip pages and Tab to cycle the collected filter."""
         if not self.is_open:
             return
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -135,9 +258,13 @@ class Inventory:
                     self.prev_page()
                 elif self.btn_next_rect.collidepoint(event.pos):
                     self.next_page()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_TAB:
+            index = self.COLLECTED_FILTERS.index(self.filter_collected)
+            collected = self.COLLECTED_FILTERS[(index + 1) % len(self.COLLECTED_FILTERS)]
+            self.set_filter(collected, self.filter_room)
 
     def render(self, display: pygame.Surface):
-        """Draw the inventory UI (background, arrows, and items at fixed slots)."""
+        """Draw the inventory UI (background, arrows, and items at the layout slots)."""
         if not self.is_open:
             return
 
@@ -151,37 +278,17 @@ class Inventory:
 
         # Determine which items to show on this page
         icon_size = TILE_SIZE * 1.5  # size for each sticker icon
-        start = self.current_page * Inventory.ITEMS_PER_PAGE
-        page_ids = self.items_order[start : start + Inventory.ITEMS_PER_PAGE]
-
-        # Predefined positions for up to 8 slots
-        positions = [
-            (sticker_1_x, sticker_1_y),
-            (sticker_2_x, sticker_2_y),
-            (sticker_3_x, sticker_3_y),
-            (sticker_4_x, sticker_4_y),
-            (sticker_5_x, sticker_5_y),
-            (sticker_6_x, sticker_6_y),
-            (sticker_7_x, sticker_7_y),
-            (sticker_8_x, sticker_8_y),
-        ]
-
-        angles = [24, -12, -34, 22, -40, -35, 25, -35]
-
-        for idx, item_id in enumerate(page_ids):
-            if idx >= len(positions):
-                break
-
-            # 1) Scale the image
-            orig = self.items[item_id].get_display_image()
-            img = pygame.transform.scale(orig, (icon_size, icon_size))
 
-            # 2) Rotate around its center
-            angle = angles[idx % len(angles)]
-            rotated_img = pygame.transform.rotate(img, angle)
+        for (x, y, angle), item_id in zip(self.slot_layout, self.page_ids(self.current_page)):
+            # 1-2) Scale and rotate around its center (cached per image/angle);
+            # a lazy load here is tracked so _sync_loaded can release it later
+            self._loaded.add(item_id)
+            orig = self.items[item_id].get_display_image()
+            rotated_img = ResourceManager.get_variant(
+                orig, size=(icon_size, icon_size), angle=angle
+            )
 
             # 3) Compute a rect so that the rotated image is centered on the slot
-            x, y = positions[idx]
             slot_center = (x + icon_size // 2, y + icon_size // 2)
             rotated_rect = rotated_img.get_rect(center=slot_center)
 
@@ -5,14 +5,14 @@ from pathlib import Path
 from settings import PICKUP_RADIUS, TILE_SIZE, PARENT_DIR
 from resource_manager import ResourceManager
 from inventory import Inventory
+from particles import SPARKLE
 
 
 class Item(pygame.sprite.Sprite):
     def __init__(self, item_id: str, image_path: str, pos: tuple[int, int], groups):
         super().__init__(groups)
         # Load and scale the sprite image
-        surf = ResourceManager.load_image(image_path)
-        self.image = pygame.transform.scale(surf, (TILE_SIZE, TILE_SIZE))
+        self.image = ResourceManager.get_variant(image_path, size=(TILE_SIZE, TILE_SIZE))
         self.rect = self.image.get_rect(topleft=pos)
         self.id = item_id
 
@@ -26,7 +26,8 @@ class ItemManager:
         inventory,
         player: pygame.sprite.Sprite,
         collision_sprites: pygame.sprite.Group,
-        reachable: set[tuple[int, int]]
+        reachable: set[tuple[int, int]],
+        particles=None
     ):
         self.tmx = tmx
         self.all_sprites = all_sprites
@@ -35,6 +36,7 @@ class ItemManager:
         self.player = player
         self.collision_sprites = collision_sprites
         self.reachable = reachable
+        self.particles = particles
 
     def spawn_items(self):
         """Spawn collectible items at positions defined in the Tiled map 'Objects' layer."""
@@ -63,9 +65,10 @@ class ItemManager:
 
             raw_id = Path(image_path).stem  # e.g. "sticker_1_64x64"
             base_id = Inventory.normalize_item_id(raw_id)  # -> "sticker_1"
+            self.inventory.set_item_room(base_id, Path(self.tmx.filename).stem)
 
             # Skip spawning if already collected
-            if base_id in self.inventory.items and self.inventory.items[base_id].picked:
+            if self.inventory.is_collected(base_id):
                 continue
 
             # Create the item sprite
@@ -76,3 +79,5 @@ class ItemManager:
         hits = pygame.sprite.spritecollide(self.player, self.item_sprites, dokill=True)
         for item in hits:
             self.inventory.pickup_item(item.id)
+            if self.particles is not None:
+                self.particles.emit(SPARKLE, item.rect.center, 40)
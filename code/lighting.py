@@ -0,0 +1,264 @@
+# lighting.py
+from collections import OrderedDict
+import math
+import numpy as np
+import pygame
+import pygame.surfarray as surfarray
+from settings import TILE_SIZE, FOG_RADIUS, PLAYER_LIGHT_RADIUS, CHUNK_SIZE, CHUNK_CACHE_PIXELS
+
+# Чанк overlay — тот же CHUNK_SIZE, что и у чанков фона
+CHUNK_CELLS = CHUNK_SIZE // TILE_SIZE
+
+
+def _upsample_matrix(cells: int, cell_pixels: int) -> np.ndarray:
+    """Матрица билинейной интерполяции: клетки -> пиксели (cells*cell_pixels x cells)."""
+    pixels = cells * cell_pixels
+    # Центр каждого пикселя в координатах клеток
+    u = (np.arange(pixels) + 0.5) / cell_pixels - 0.5
+    u = np.clip(u, 0, cells - 1)
+    lo = np.floor(u).astype(int)
+    hi = np.minimum(lo + 1, cells - 1)
+    frac = (u - lo).astype(np.float32)
+    weights = np.zeros((pixels, cells), dtype=np.float32)
+    rows = np.arange(pixels)
+    weights[rows, lo] += 1 - frac
+    weights[rows, hi] += frac
+    return weights
+
+
+class RoomLighting:
+    """Состояние освещения одной комнаты на сетке клеток (индексы [x, y])."""
+
+    def __init__(self, tmx, free_cells: set[tuple[int, int]], scale: float = 1.0):
+        self.width, self.height = tmx.width, tmx.height
+        props = tmx.properties
+        self.darkness = int(props.get('darkness', 0))
+        self.fog = bool(props.get('fog', False))
+        self.enabled = self.darkness > 0 or self.fog
+
+        # Свободные клетки из коллизий карты
+        self.free = np.zeros((self.width, self.height), dtype=bool)
+        for tx, ty in free_cells:
+            if 0 <= tx < self.width and 0 <= ty < self.height:
+                self.free[tx, ty] = True
+        self.revealed = np.zeros_like(self.free)
+
+        # Статичные источники света из слоя 'Lights': (x, y, radius) в клетках
+        self.lights: list[tuple[float, float, float]] = []
+        lights_layer = tmx.layernames.get('Lights')
+        if lights_layer is not None:
+            for obj in lights_layer:
+                radius = float(obj.properties.get('radius', PLAYER_LIGHT_RADIUS))
+                self.lights.append((obj.x / TILE_SIZE, obj.y / TILE_SIZE, radius))
+
+        self.player_cell = None
+        self.alpha = np.zeros((self.width, self.height), dtype=np.float32)
+        # Overlay по чанкам (cx, cy) -> Surface; чанк интерполируется, когда впервые виден
+        self._chunks: dict[tuple[int, int], pygame.Surface] = {}
+        # LRU-кеш растянутых под zoom камеры чанков overlay: (zoom, cx, cy) -> Surface
+        self._scaled: "OrderedDict[tuple[float, int, int], pygame.Surface]" = OrderedDict()
+        self._scaled_pixels = 0
+        self.scale = None
+        self.set_scale(scale)
+
+    def set_scale(self, scale: float) -> None:
+        """Разрешение overlay: scale * TILE_SIZE пикселей на клетку.
+
+        Чанки старого разрешения отбрасываются; новые строятся в get_chunk, когда
+        попадают в кадр, так что смена качества стоит лишь видимой области.
+        """
+        if not self.enabled or scale == self.scale:
+            return
+        self.scale = scale
+        self.cell_pixels = round(TILE_SIZE * scale)
+        self._wx = _upsample_matrix(self.width, self.cell_pixels)
+        self._wy = _upsample_matrix(self.height, self.cell_pixels)
+        self._clear_chunks()
+
+    def release(self) -> None:
+        """Освободить чанки overlay при выходе из комнаты; туман и свет остаются в массивах."""
+        self._clear_chunks()
+
+    def _clear_chunks(self) -> None:
+        self._chunks.clear()
+        self._scaled.clear()
+        self._scaled_pixels = 0
+
+    def _compute_alpha(self) -> np.ndarray:
+        """Затемнение каждой клетки 0..255 по текущим светам и туману."""
+        xs, ys = np.ogrid[0:self.width, 0:self.height]
+        xs = xs + 0.5
+        ys = ys + 0.5
+        alpha = np.zeros((self.width, self.height), dtype=np.float32)
+
+        if self.darkness:
+            light = np.zeros_like(alpha)
+            lights = list(self.lights)
+            if self.player_cell is not None:
+                px, py = self.player_cell
+                lights.append((px + 0.5, py + 0.5, PLAYER_LIGHT_RADIUS))
+            for lx, ly, radius in lights:
+                dist = np.sqrt((xs - lx) ** 2 + (ys - ly) ** 2)
+                np.maximum(light, np.clip(1 - dist / radius, 0, 1), out=light)
+            alpha += self.darkness * (1 - light)
+
+        if self.fog:
+            alpha[~self.revealed] = 255
+        return alpha
+
+    def _reveal(self, cell: tuple[int, int]) -> None:
+        """Открывает свободные клетки в радиусе FOG_RADIUS и стены рядом с ними."""
+        xs, ys = np.ogrid[0:self.width, 0:self.height]
+        disk = (xs - cell[0]) ** 2 + (ys - cell[1]) ** 2 <= FOG_RADIUS ** 2
+        seen = disk & self.free
+        # Стены, примыкающие к открытому полу, тоже видны
+        grown = seen.copy()
+        grown[1:, :] |= seen[:-1, :]
+        grown[:-1, :] |= seen[1:, :]
+        grown[:, 1:] |= seen[:, :-1]
+        grown[:, :-1] |= seen[:, 1:]
+        self.revealed |= grown & disk
+
+    def update(self, player_rect: pygame.Rect) -> None:
+        """Пересчитывает сетку только при смене клетки игрока или светов."""
+        if not self.enabled:
+            return
+        cell = (player_rect.centerx // TILE_SIZE, player_rect.centery // TILE_SIZE)
+        if cell == self.player_cell:
+            return
+        self.player_cell = cell
+        if self.fog:
+            self._reveal(cell)
+        self._refresh()
+
+    def _refresh(self) -> None:
+        """Перерисовывает в построенных чанках overlay только область изменившихся клеток."""
+        alpha = self._compute_alpha()
+        changed = np.argwhere(alpha != self.alpha)
+        self.alpha = alpha
+        if not len(changed):
+            return
+        # +1 клетка: билинейная интерполяция захватывает соседей
+        x0, y0 = np.maximum(changed.min(axis=0) - 1, 0)
+        x1, y1 = np.minimum(changed.max(axis=0) + 2, (self.width, self.height))
+        self._write(x0, y0, x1, y1)
+
+    def _write(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """Интерполирует клетки [x0, x1) x [y0, y1) в альфу уже построенных чанков."""
+        for cx in range(x0 // CHUNK_CELLS, (x1 - 1) // CHUNK_CELLS + 1):
+            for cy in range(y0 // CHUNK_CELLS, (y1 - 1) // CHUNK_CELLS + 1):
+                chunk = self._chunks.get((cx, cy))
+                if chunk is None:
+                    continue  # ещё не виден — построится из актуальной альфы
+                self._write_chunk(chunk, cx, cy, x0, y0, x1, y1)
+                # Растянутые версии этого чанка устарели
+                for key in [k for k in self._scaled if k[1:] == (cx, cy)]:
+                    old = self._scaled.pop(key)
+                    self._scaled_pixels -= old.get_width() * old.get_height()
+
+    def _write_chunk(self, chunk: pygame.Surface, cx: int, cy: int,
+                     x0: int, y0: int, x1: int, y1: int) -> None:
+        """Пишет в чанк (cx, cy) пересечение его клеток с [x0, x1) x [y0, y1)."""
+        x0, x1 = max(x0, cx * CHUNK_CELLS), min(x1, (cx + 1) * CHUNK_CELLS)
+        y0, y1 = max(y0, cy * CHUNK_CELLS), min(y1, (cy + 1) * CHUNK_CELLS)
+        px0, px1 = x0 * self.cell_pixels, x1 * self.cell_pixels
+        py0, py1 = y0 * self.cell_pixels, y1 * self.cell_pixels
+        block = self._wx[px0:px1] @ self.alpha @ self._wy[py0:py1].T
+        # Начало чанка в пикселях overlay
+        ox = cx * CHUNK_CELLS * self.cell_pixels
+        oy = cy * CHUNK_CELLS * self.cell_pixels
+        pixels = surfarray.pixels_alpha(chunk)
+        pixels[px0 - ox:px1 - ox, py0 - oy:py1 - oy] = np.clip(block, 0, 255).astype(np.uint8)
+        del pixels  # снимаем блокировку Surface
+
+    def get_chunk(self, zoom: float, cx: int, cy: int) -> pygame.Surface | None:
+        """Чанк overlay под zoom (экранных пикселей на пиксель мира); None — вне карты.
+
+        При zoom == scale это сам чанк overlay, иначе — его растянутая копия из LRU-кеша.
+        """
+        if not (0 <= cx * CHUNK_CELLS < self.width and 0 <= cy * CHUNK_CELLS < self.height):
+            return None
+        chunk = self._chunks.get((cx, cy))
+        if chunk is None:
+            cells_w = min(CHUNK_CELLS, self.width - cx * CHUNK_CELLS)
+            cells_h = min(CHUNK_CELLS, self.height - cy * CHUNK_CELLS)
+            chunk = pygame.Surface(
+                (cells_w * self.cell_pixels, cells_h * self.cell_pixels), pygame.SRCALPHA
+            ).convert_alpha()
+            chunk.fill((0, 0, 0, 0))
+            self._write_chunk(chunk, cx, cy, 0, 0, self.width, self.height)
+            self._chunks[(cx, cy)] = chunk
+        if zoom == self.scale:
+            return chunk
+
+        key = (zoom, cx, cy)
+        scaled = self._scaled.get(key)
+        if scaled is not None:
+            self._scaled.move_to_end(key)
+            return scaled
+        # Неполные чанки на краю карты дополняем прозрачным, чтобы масштаб был единым
+        size = CHUNK_CELLS * self.cell_pixels
+        padded = pygame.Surface((size, size), pygame.SRCALPHA).convert_alpha()
+        padded.fill((0, 0, 0, 0))
+        padded.blit(chunk, (0, 0))
+        side = round(CHUNK_SIZE * zoom)
+        scaled = pygame.transform.scale(padded, (side, side))
+
+        self._scaled[key] = scaled
+        self._scaled_pixels += side * side
+        # Вытесняем давно не использованные чанки (обычно — других уровней zoom)
+        while self._scaled_pixels > CHUNK_CACHE_PIXELS and len(self._scaled) > 1:
+            _, old = self._scaled.popitem(last=False)
+            self._scaled_pixels -= old.get_width() * old.get_height()
+        return scaled
+
+
+class LightingLayer:
+    """Слой света и тумана войны, кешируется по комнатам."""
+
+    def __init__(self):
+        self.rooms: dict[str, RoomLighting] = {}
+        self.current: RoomLighting | None = None
+        # Разрешение overlay относительно TILE_SIZE (понижается QualityGovernor)
+        self.scale = 1.0
+
+    def enter_room(self, room_name: str, tmx, free_cells: set[tuple[int, int]]) -> None:
+        """Переключиться на комнату; открытая часть тумана сохраняется между визитами."""
+        if room_name not in self.rooms:
+            self.rooms[room_name] = RoomLighting(tmx, free_cells, self.scale)
+        room = self.rooms[room_name]
+        # Поверхности держит только текущая комната, так что бюджет чанков один на слой
+        if self.current is not None and self.current is not room:
+            self.current.release()
+        self.current = room
+        self.current.set_scale(self.scale)
+        self.current.player_cell = None
+
+    def set_scale(self, scale: float) -> None:
+        """Сменить разрешение overlay; другие комнаты перестроятся при входе в них."""
+        self.scale = scale
+        if self.current:
+            self.current.set_scale(scale)
+
+    def update(self, player_rect: pygame.Rect) -> None:
+        if self.current:
+            self.current.update(player_rect)
+
+    def draw(self, display: pygame.Surface, offset: pygame.math.Vector2, zoom: float = 1.0) -> None:
+        """Затемнение поверх мира (offset и zoom — из CameraGroup), в той же сетке чанков, что и фон."""
+        if not self.current or not self.current.enabled:
+            return
+        origin_x = round(-offset.x * zoom)
+        origin_y = round(-offset.y * zoom)
+        view_w = display.get_width() / zoom
+        view_h = display.get_height() / zoom
+        scaled_chunk = round(CHUNK_SIZE * zoom)
+        blits = []
+        for cx in range(max(math.floor(offset.x / CHUNK_SIZE), 0),
+                        math.floor((offset.x + view_w) / CHUNK_SIZE) + 1):
+            for cy in range(max(math.floor(offset.y / CHUNK_SIZE), 0),
+                            math.floor((offset.y + view_h) / CHUNK_SIZE) + 1):
+                chunk = self.current.get_chunk(zoom, cx, cy)
+                if chunk is not None:
+                    blits.append((chunk, (origin_x + cx * scaled_chunk, origin_y + cy * scaled_chunk)))
+        display.blits(blits, doreturn=False)
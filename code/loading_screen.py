@@ -0,0 +1,38 @@
+# loading_screen.py
+import pygame
+from settings import *
+
+
+class LoadingScreen:
+    """Экран загрузки: заголовок, название этапа и полоса прогресса."""
+    BAR_WIDTH = 480
+    BAR_HEIGHT = 16
+    BAR_COLOR = (230, 230, 230)
+
+    def __init__(self, display_surface):
+        self.display = display_surface
+        # Шрифт по умолчанию — не требует файлов из data/
+        self.title_font = pygame.font.Font(None, 64)
+        self.stage_font = pygame.font.Font(None, 28)
+        self.title = self.title_font.render("JourneyPL", True, self.BAR_COLOR)
+        self.title_rect = self.title.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 60))
+        self.bar_rect = pygame.Rect(0, 0, self.BAR_WIDTH, self.BAR_HEIGHT)
+        self.bar_rect.center = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 20)
+
+    def draw(self, progress: float, stage: str = ""):
+        """Нарисовать экран с прогрессом 0..1 и сразу показать его."""
+        # Обрабатываем очередь событий, чтобы окно не «зависало» во время загрузки
+        pygame.event.pump()
+        self.display.fill('black')
+        self.display.blit(self.title, self.title_rect)
+
+        pygame.draw.rect(self.display, self.BAR_COLOR, self.bar_rect, width=2)
+        fill = self.bar_rect.inflate(-6, -6)
+        fill.width = int(fill.width * max(0.0, min(progress, 1.0)))
+        if fill.width:
+            pygame.draw.rect(self.display, self.BAR_COLOR, fill)
+
+        if stage:
+            label = self.stage_font.render(stage, True, self.BAR_COLOR)
+            self.display.blit(label, label.get_rect(midtop=(WINDOW_WIDTH // 2, self.bar_rect.bottom + 12)))
+        pygame.display.flip()
@@ -1,4 +1,11 @@
 # main.py
+import time
+
+# Отсчёт time-to-first-frame начинается до тяжёлых импортов (pygame, pytmx, numpy)
+_boot_start = time.perf_counter()
+
+import argparse
+import logging
 import pygame
 from pygame.math import Vector2
 from collections import deque
@@ -7,6 +14,7 @@ from pathlib import Path
 from settings import *
 from resource_manager import ResourceManager
 from sprites import WorldSprite
+from map_analysis import ground_render_tiles
 from player import Player
 from groups import CameraGroup
 from inventory import Inventory
@@ -14,55 +22,115 @@ from item_manager import ItemManager
 from music_manager import MusicManager
 from room_notifier import RoomNotifier
 from door_notifier import DoorNotifier  # импортируем DoorNotifier
+from loading_screen import LoadingScreen
+from lighting import LightingLayer
+from particles import ParticleSystem, DUST
+from controls import InputSource, LiveInput, InputRecorder, ReplayInput
+from quality import QualityGovernor, QualityLevel
+
+# Время импорта модулей игры — первый этап в отчёте о загрузке
+_imports_seconds = time.perf_counter() - _boot_start
 
 
 class Game:
-    def __init__(self):
-        # Инициализация Pygame и аудио
+    def __init__(self, headless: bool = False, controls: InputSource | None = None):
+        # headless: без музыки (для автотестов под SDL dummy-драйвером)
+        self.headless = headless
+        # Источник ввода: клавиатура, запись сессии или воспроизведение
+        self.controls = controls or LiveInput()
+        # Адаптивное качество по времени кадров
+        self.governor = QualityGovernor()
+        # Время старта для отчёта time-to-first-frame: первый Game в процессе
+        # считает и импорты, следующие — от своего создания
+        global _boot_start
+        self.boot_timings: list[tuple[str, float]] = []
+        if _boot_start is not None:
+            self.boot_start = _boot_start
+            self.boot_timings.append(('imports', _imports_seconds))
+            _boot_start = None
+        else:
+            self.boot_start = time.perf_counter()
+        self.boot_reported = False
+
+        # Инициализация Pygame и окна — сразу показываем экран загрузки
+        stage_start = time.perf_counter()
         pygame.init()
         pygame.mixer.init()
         self.display = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption("JourneyPL")
+        self.clock = pygame.time.Clock()
+        self.running = True
+        self.loading_screen = LoadingScreen(self.display)
+        self.loading_screen.draw(0.0)
+        self.boot_timings.append(('display', time.perf_counter() - stage_start))
+
+        # Остальные этапы выполняются по очереди, между ними обновляется экран загрузки
+        stages = [
+            ('banners', self._boot_banners),
+            ('music', self._boot_music),
+            ('inventory', self._boot_inventory),
+            ('map', self._boot_map),
+            ('setup', self.setup),
+            ('stickers', self._boot_stickers),
+            ('items', self._boot_items),
+        ]
+        if headless:
+            # Музыка в headless-режиме не нужна
+            stages = [stage for stage in stages if stage[0] != 'music']
+        for index, (name, stage) in enumerate(stages):
+            self.loading_screen.draw(index / len(stages), name)
+            stage_start = time.perf_counter()
+            stage()
+            self.boot_timings.append((name, time.perf_counter() - stage_start))
+        self.loading_screen.draw(1.0)
+
+        # Баннер стартовой комнаты — чтобы фейд не «сгорел» во время загрузки
+        self.room_notifier.show(Path(MAPS_DIR / 'corridor.tmx').stem)
+        # Сбрасываем часы, иначе первый dt включит всё время загрузки
+        self.clock.tick()
 
-        # Инициализация баннера комнат и показываем стартовый (при необходимости)
+    def _boot_banners(self):
+        # Инициализация баннера комнат (стартовый показываем после загрузки)
         self.room_notifier = RoomNotifier(self.display)
-        self.room_notifier.show(Path(MAPS_DIR / 'corridor.tmx').stem)
 
         # Инициализация баннера двери
         self.door_notifier = DoorNotifier(self.display)
         # Флаг, показывающий, был ли контакт с дверью на прошлом кадре
         self.was_touching_door = False
 
-        pygame.display.set_caption("JourneyPL")
-        self.clock = pygame.time.Clock()
-        self.running = True
-
+    def _boot_music(self):
         # Фоновая музыка
         self.music = MusicManager(volume=0.3)
         self.music.load('A_Walk_Along_the_Gates.mp3')
         self.music.play(loops=-1)
 
+    def _boot_inventory(self):
         # Инвентарь
         self.inventory = Inventory()
 
+        # Освещение и туман войны (кеш по комнатам)
+        self.lighting = LightingLayer()
+        # Частицы (искры при подборе, пыль у дверей)
+        self.particles = ParticleSystem()
+
         # Группы спрайтов
         self.all_sprites = CameraGroup()
         self.collision_sprites = pygame.sprite.Group()
         self.item_sprites = pygame.sprite.Group()
         self.door_sprites = pygame.sprite.Group()
 
+    def _boot_map(self):
         # Загрузка первой карты (corridor.tmx)
         self.tmx = ResourceManager.load_tmx(MAPS_DIR / 'corridor.tmx')
 
-        # Построение мира, игрока и доступных для движения тайлов
-        self.setup()
-
-        # Предрегистрация слотов для наклеек (стикеров)
+    def _boot_stickers(self):
+        # Предрегистрация слотов для наклеек (стикеров); картинки грузятся при открытии страницы
         stickers_dir = STICKERS_DIR
-        for png_path in stickers_dir.glob('*.png'):
+        for png_path in sorted(stickers_dir.glob('*.png')):
             rel = png_path.relative_to(PARENT_DIR)
-            surf = ResourceManager.load_image(rel)
-            self.inventory.register_item(png_path.stem, surf)
+            self.inventory.register_item(png_path.stem, rel)
 
+    def _boot_items(self):
         # Спавн коллекционных предметов на первой карте
         self.item_manager = ItemManager(
             self.tmx,
@@ -71,27 +139,30 @@ class Game:
             self.inventory,
             self.player,
             self.collision_sprites,
-            self.reachable
+            self.reachable,
+            self.particles
         )
         self.item_manager.spawn_items()
 
+    def report_boot(self):
+        """Печатает время каждого этапа загрузки и время до первого кадра."""
+        first_frame = time.perf_counter() - self.boot_start
+        print("JourneyPL boot:")
+        for name, seconds in self.boot_timings:
+            print(f"  {name:<10} {seconds * 1000:8.1f} ms")
+        print(f"  {'first frame':<10} {first_frame * 1000:8.1f} ms")
+        self.boot_reported = True
+
     def setup(self):
         # Очищаем предыдущие спрайты
         self.all_sprites.empty()
         self.collision_sprites.empty()
         self.item_sprites.empty()
         self.door_sprites.empty()
+        self.particles.clear()
 
-        # Рисуем слои земли
-        for x, y, img in self.tmx.get_layer_by_name('Ground').tiles():
-            WorldSprite((x * TILE_SIZE, y * TILE_SIZE), img, [self.all_sprites], ground=True)
-        for x, y, img in self.tmx.get_layer_by_name('Ground_layer1').tiles():
-            WorldSprite((x * TILE_SIZE, y * TILE_SIZE), img, [self.all_sprites], ground=True)
-        for x, y, img in self.tmx.get_layer_by_name('Ground_layer2').tiles():
-            WorldSprite((x * TILE_SIZE, y * TILE_SIZE), img, [self.all_sprites], ground=True)
-        for x, y, img in self.tmx.get_layer_by_name('Ground_layer3').tiles():
-            WorldSprite((x * TILE_SIZE, y * TILE_SIZE), img, [self.all_sprites], ground=True)
-        for x, y, img in self.tmx.get_layer_by_name('Ground_layer4').tiles():
+        # Рисуем слои земли: только видимые тайлы (скрытые слои и перекрытые клетки отброшены)
+        for x, y, img in ground_render_tiles(self.tmx):
             WorldSprite((x * TILE_SIZE, y * TILE_SIZE), img, [self.all_sprites], ground=True)
 
         # Создаём игрока из слоя 'Entities'
@@ -100,7 +171,8 @@ class Game:
                 self.player = Player(
                     Vector2(obj.x, obj.y),
                     [self.all_sprites],
-                    self.collision_sprites
+                    self.collision_sprites,
+                    self.controls
                 )
                 self.all_sprites.set_target(self.player)
                 break
@@ -174,6 +246,7 @@ class Game:
                     reachable.add(nb)
                     queue.append(nb)
         self.reachable = reachable
+        self.lighting.enter_room(Path(self.tmx.filename).stem, self.tmx, free)
 
     def change_level(self, map_filename: str, spawn_pos: tuple[int, int] | None):
         # Загрузка следующей карты
@@ -185,6 +258,8 @@ class Game:
             self.player.hitbox_rect.center = spawn_pos
             self.player.rect.center = spawn_pos
         self.all_sprites.set_target(self.player)
+        # Пыль в точке появления после прохода через дверь
+        self.particles.emit(DUST, self.player.hitbox_rect.midbottom, 30)
         # Возрождаем предметы
         self.item_manager = ItemManager(
             self.tmx,
@@ -193,15 +268,16 @@ class Game:
             self.inventory,
             self.player,
             self.collision_sprites,
-            self.reachable
+            self.reachable,
+            self.particles
         )
         self.item_manager.spawn_items()
         room_name = Path(map_filename).stem
         self.room_notifier.show(room_name)
 
-    def handle_events(self):
-        """Обработка входящих событий Pygame."""
-        for e in pygame.event.get():
+    def handle_events(self, events):
+        """Обработка событий кадра (из InputSource)."""
+        for e in events:
             # Выход из игры
             if e.type == pygame.QUIT:
                 self.running = False
@@ -211,6 +287,12 @@ class Game:
                 if e.key == pygame.K_i:
                     self.inventory.toggle()
 
+                # Масштаб камеры: '-' отдалить, '=' приблизить
+                elif e.key == pygame.K_MINUS:
+                    self.all_sprites.zoom_out()
+                elif e.key == pygame.K_EQUALS:
+                    self.all_sprites.zoom_in()
+
                 elif e.key == pygame.K_e:
                     # Взаимодействие с дверью по нажатию клавиши 'E'
                     hits = pygame.sprite.spritecollide(
@@ -223,14 +305,15 @@ class Game:
                         door = hits[0]
                         self.change_level(door.target_map, door.spawn_pos)
 
-            # Передаём нажатия мыши в инвентарь
-            if e.type == pygame.MOUSEBUTTONDOWN:
+            # Передаём нажатия мыши и клавиш в инвентарь
+            if e.type in (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN):
                 self.inventory.handle_event(e)
 
     def update(self, dt):
         # Обновляем состояние предметов и спрайтов
         self.item_manager.check_pickups()
         self.all_sprites.update(dt)
+        self.particles.update(dt)
 
         # Проверяем столкновение игрока с дверьми (без нажатий)
         hits = pygame.sprite.spritecollide(
@@ -240,14 +323,18 @@ class Game:
             collided=lambda p, d: p.hitbox_rect.colliderect(d.rect)
         )
         if hits:
-            # Если только что коснулись двери – показываем баннер
+            # Если только что коснулись двери – показываем баннер и пыль
             if not self.was_touching_door:
                 self.door_notifier.show()
+                self.particles.emit(DUST, hits[0].rect.midbottom, 20)
             self.was_touching_door = True
         else:
             # Сброс флага, когда игрок отошёл от двери
             self.was_touching_door = False
 
+        # Туман и свет пересчитываются только при смене клетки игрока
+        self.lighting.update(self.player.rect)
+
         # Обновляем анимации баннеров
         self.room_notifier.update()
         self.door_notifier.update()
@@ -255,6 +342,12 @@ class Game:
     def render(self):
         self.display.fill('black')
         self.all_sprites.draw(self.player)
+        # Частицы и свет рисуются в ту же поверхность, что и мир (с учётом render_scale)
+        world, zoom = self.all_sprites.surface, self.all_sprites.view_zoom
+        self.particles.draw(world, self.all_sprites.offset, zoom)
+        # Затемнение и туман — видимые чанки overlay поверх мира
+        self.lighting.draw(world, self.all_sprites.offset, zoom)
+        self.all_sprites.present()
         # Отрисовываем баннер комнаты (если активен)
         self.room_notifier.draw()
         # Отрисовываем баннер двери (если активен)
@@ -262,14 +355,64 @@ class Game:
         self.inventory.render(self.display)
         pygame.display.flip()
 
-    def run(self):
-        while self.running:
-            dt = self.clock.tick(FPS) / 600
-            self.handle_events()
-            self.update(dt)
-            self.render()
+    def apply_quality(self, level: QualityLevel):
+        """Применить уровень качества, выбранный QualityGovernor."""
+        self.all_sprites.render_scale = level.render_scale
+        self.lighting.set_scale(level.lighting_scale)
+        self.particles.emit_scale = level.particle_scale
+        self.room_notifier.fade = level.banner_fades
+        self.door_notifier.fade = level.banner_fades
+
+    def run(self, fast_forward: bool = False):
+        """Главный цикл. fast_forward: без render и без ограничения FPS (для воспроизведения записей)."""
+        frames = 0
+        sim_time = 0.0
+        wall_start = time.perf_counter()
+        try:
+            while self.running:
+                state = self.controls.poll(None if fast_forward else self.clock)
+                if state is None:
+                    break  # запись закончилась или окно закрыто во время воспроизведения
+                frame_start = time.perf_counter()
+                self.handle_events(state.events)
+                self.update(state.dt)
+                frames += 1
+                sim_time += state.dt * 600 / 1000
+                if not fast_forward:
+                    self.render()
+                    # Время работы кадра (без ожидания в clock.tick) — для QualityGovernor
+                    level = self.governor.record((time.perf_counter() - frame_start) * 1000)
+                    if level is not None:
+                        self.apply_quality(level)
+                # После первого кадра (в fast-forward — первого обновления) — отчёт о загрузке
+                if not self.boot_reported:
+                    self.report_boot()
+        finally:
+            self.controls.close()
+        if fast_forward:
+            wall = time.perf_counter() - wall_start
+            print(f"fast-forward: {frames} frames, {sim_time:.1f} s simulated in {wall:.2f} s, "
+                  f"player at {self.player.hitbox_rect.center}, "
+                  f"collected {sum(item.picked for item in self.inventory.items.values())}")
         pygame.quit()
 
 
 if __name__ == '__main__':
-    Game().run()
+    parser = argparse.ArgumentParser(description="JourneyPL")
+    parser.add_argument('--record', metavar='FILE', help="record the session input to FILE")
+    parser.add_argument('--replay', metavar='FILE', help="replay a recorded session from FILE")
+    parser.add_argument('--fast-forward', action='store_true',
+                        help="with --replay: run updates as fast as possible without rendering")
+    parser.add_argument('--log-quality', action='store_true',
+                        help="log adaptive quality decisions")
+    args = parser.parse_args()
+    if args.log_quality:
+        logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+
+    if args.replay:
+        controls = ReplayInput(args.replay)
+    elif args.record:
+        controls = InputRecorder(LiveInput(), args.record)
+    else:
+        controls = LiveInput()
+    Game(controls=controls).run(fast_forward=bool(args.replay and args.fast_forward))
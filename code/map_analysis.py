@@ -0,0 +1,63 @@
+# map_analysis.py
+import pygame
+from settings import TILE_SIZE
+
+# Слои земли снизу вверх — в этом порядке они рисуются
+GROUND_LAYERS = ('Ground', 'Ground_layer1', 'Ground_layer2', 'Ground_layer3', 'Ground_layer4')
+
+# Кеш: полностью ли непрозрачен тайл (тайлы общие для всех карт)
+_opaque_tiles: dict[pygame.Surface, bool] = {}
+# Кеш результата анализа по файлу карты
+_ground_tiles: dict[str, list[tuple[int, int, pygame.Surface]]] = {}
+
+
+def is_opaque_tile(image: pygame.Surface) -> bool:
+    """True, если тайл закрывает всю клетку: размер TILE_SIZE и ни одного прозрачного пикселя."""
+    opaque = _opaque_tiles.get(image)
+    if opaque is None:
+        if image.get_size() != (TILE_SIZE, TILE_SIZE):
+            opaque = False
+        elif not image.get_flags() & pygame.SRCALPHA and image.get_colorkey() is None:
+            opaque = True
+        else:
+            # Маска по порогу 254: в неё попадают только пиксели с альфой 255
+            opaque = pygame.mask.from_surface(image, 254).count() == TILE_SIZE * TILE_SIZE
+        _opaque_tiles[image] = opaque
+    return opaque
+
+
+def ground_render_tiles(tmx) -> list[tuple[int, int, pygame.Surface]]:
+    """
+    Тайлы земли, которые действительно видны, в порядке отрисовки (снизу вверх).
+
+    1. Невидимые слои (visible="0") и слои с нулевой прозрачностью пропускаются.
+    2. Слои проходятся сверху вниз; клетка считается закрытой, как только на ней
+       встретился полностью непрозрачный тайл слоя с opacity 1.
+    3. Тайлы нижних слоёв под закрытыми клетками не попадают в результат.
+    """
+    key = tmx.filename
+    if key in _ground_tiles:
+        return _ground_tiles[key]
+
+    layers = [
+        tmx.get_layer_by_name(name) for name in GROUND_LAYERS
+        if name in tmx.layernames
+    ]
+    layers = [layer for layer in layers if layer.visible and layer.opacity > 0]
+
+    covered: set[tuple[int, int]] = set()
+    kept_per_layer = []
+    for layer in reversed(layers):
+        occludes = layer.opacity >= 1 and not layer.offsetx and not layer.offsety
+        kept = []
+        for x, y, image in layer.tiles():
+            if (x, y) in covered:
+                continue
+            kept.append((x, y, image))
+        if occludes:
+            covered.update((x, y) for x, y, image in kept if is_opaque_tile(image))
+        kept_per_layer.append(kept)
+
+    tiles = [tile for kept in reversed(kept_per_layer) for tile in kept]
+    _ground_tiles[key] = tiles
+    return tiles
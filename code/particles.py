@@ -0,0 +1,137 @@
+# particles.py
+import numpy as np
+import pygame
+from resource_manager import ResourceManager
+from settings import PARTICLE_CAPACITY
+
+# Время и скорость — в единицах dt игры (Game.run: мс / 600)
+SPARKLE = 0
+DUST = 1
+
+# Параметры видов частиц: цвет, радиус спрайта, скорость, время жизни, гравитация, затухание скорости
+PARTICLE_KINDS = {
+    SPARKLE: dict(color=(255, 230, 120), radius=4, speed=(80, 220), life=(0.6, 1.2), gravity=-40, drag=0.90),
+    DUST: dict(color=(170, 160, 150), radius=6, speed=(20, 90), life=(0.8, 1.6), gravity=-15, drag=0.85),
+}
+# Число заранее отрисованных уровней прозрачности на вид
+ALPHA_LEVELS = 8
+
+
+def _make_sprite(color, radius) -> pygame.Surface:
+    """Мягкая круглая частица: несколько кругов с убывающей альфой."""
+    size = radius * 2
+    surf = pygame.Surface((size, size), pygame.SRCALPHA)
+    for r in range(radius, 0, -1):
+        alpha = int(255 * (1 - (r - 1) / radius) ** 0.5)
+        pygame.draw.circle(surf, (*color, alpha), (radius, radius), r)
+    return surf
+
+
+class ParticleSystem:
+    """Частицы в заранее выделенных NumPy-массивах; отрисовка одним blits."""
+
+    def __init__(self, capacity: int = PARTICLE_CAPACITY, seed: int | None = None):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)      # оставшееся время; <= 0 — слот свободен
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.rng = np.random.default_rng(seed)
+        # Доля выпускаемых частиц (понижается QualityGovernor)
+        self.emit_scale = 1.0
+
+        # Параметры видов в виде массивов для векторных шагов
+        kinds = sorted(PARTICLE_KINDS)
+        self.gravity = np.array([PARTICLE_KINDS[k]['gravity'] for k in kinds], dtype=np.float32)
+        self.drag = np.array([PARTICLE_KINDS[k]['drag'] for k in kinds], dtype=np.float32)
+
+        # Таблицы спрайтов по масштабу отрисовки: zoom -> (спрайты, полуразмеры видов)
+        self._tables: dict[float, tuple[np.ndarray, np.ndarray]] = {}
+        self._sprite_table(1.0)
+
+    def _sprite_table(self, zoom: float) -> tuple[np.ndarray, np.ndarray]:
+        """Спрайты, нарисованные под zoom: индекс = kind * ALPHA_LEVELS + уровень альфы."""
+        table = self._tables.get(zoom)
+        if table is not None:
+            return table
+        sprites = []
+        half_size = []
+        for k in sorted(PARTICLE_KINDS):
+            # Круг рисуется сразу нужного радиуса — мягче, чем растягивать готовый
+            radius = max(1, round(PARTICLE_KINDS[k]['radius'] * zoom))
+            base = _make_sprite(PARTICLE_KINDS[k]['color'], radius)
+            half_size.append(radius)
+            for level in range(ALPHA_LEVELS):
+                alpha = int(255 * (level + 1) / ALPHA_LEVELS)
+                sprites.append(ResourceManager.get_variant(base, alpha=alpha))
+        table = (np.empty(len(sprites), dtype=object), np.array(half_size, dtype=np.float32))
+        table[0][:] = sprites
+        self._tables[zoom] = table
+        return table
+
+    @property
+    def count(self) -> int:
+        """Количество живых частиц."""
+        return int(np.count_nonzero(self.life > 0))
+
+    def emit(self, kind: int, pos, count: int) -> None:
+        """Выпустить до count * emit_scale частиц вида kind из точки pos (лишние отбрасываются)."""
+        count = round(count * self.emit_scale)
+        free = np.flatnonzero(self.life <= 0)[:count]
+        n = len(free)
+        if not n:
+            return
+        params = PARTICLE_KINDS[kind]
+        angle = self.rng.uniform(0, 2 * np.pi, n)
+        speed = self.rng.uniform(*params['speed'], n)
+        life = self.rng.uniform(*params['life'], n)
+
+        self.pos[free] = pos
+        self.vel[free, 0] = np.cos(angle) * speed
+        self.vel[free, 1] = np.sin(angle) * speed
+        self.life[free] = life
+        self.max_life[free] = life
+        self.kind[free] = kind
+
+    def clear(self) -> None:
+        """Убрать все частицы (например, при смене карты)."""
+        self.life[:] = 0
+
+    def update(self, dt: float) -> None:
+        """Векторный шаг: движение, гравитация, затухание скорости и жизни."""
+        alive = self.life > 0
+        if not alive.any():
+            return
+        kind = self.kind[alive]
+        vel = self.vel[alive]
+        vel[:, 1] += self.gravity[kind] * dt
+        vel *= (self.drag[kind] ** (dt * 60))[:, None]
+        self.vel[alive] = vel
+        self.pos[alive] += vel * dt
+        self.life[alive] -= dt
+
+    def draw(self, display: pygame.Surface, offset: pygame.math.Vector2, zoom: float = 1.0) -> None:
+        """Все живые частицы — одним вызовом fblits/blits (offset и zoom — из CameraGroup).
+
+        Размер спрайтов следует zoom, так что масштаб камеры и render_scale
+        не меняют видимый размер частиц относительно мира.
+        """
+        alive = np.flatnonzero(self.life > 0)
+        if not len(alive):
+            return
+        sprites, half_size = self._sprite_table(zoom)
+        kind = self.kind[alive]
+        fraction = self.life[alive] / self.max_life[alive]
+        level = np.minimum((fraction * ALPHA_LEVELS).astype(np.intp), ALPHA_LEVELS - 1)
+        surfaces = sprites[kind.astype(np.intp) * ALPHA_LEVELS + level]
+
+        topleft = (self.pos[alive] - (offset.x, offset.y)) * zoom - half_size[kind][:, None]
+        positions = topleft.astype(np.int32).tolist()
+
+        # fblits есть в pygame-ce, в обычном pygame — blits без списка Rect
+        fblits = getattr(display, 'fblits', None)
+        if fblits is not None:
+            fblits(zip(surfaces, positions))
+        else:
+            display.blits(zip(surfaces, positions), doreturn=False)
@@ -9,7 +9,7 @@ from image_utils import collect_image_paths, load_images_from_paths
 class Player(pygame.sprite.Sprite):
     _frames_cache: Dict[str, List[Surface]] = {}
 
-    def __init__(self, pos, groups, collision_sprites):
+    def __init__(self, pos, groups, collision_sprites, controls):
         super().__init__(groups)
         # Завантажуємо спрайти анімації один раз
         if not Player._frames_cache:
@@ -27,13 +27,14 @@ class Player(pygame.sprite.Sprite):
         self.direction = pygame.Vector2()
         self.speed = 200  # зменшили швидкість
         self.collisions = collision_sprites
+        # Джерело вводу (жива клавіатура або запис), опитується Game раз на кадр
+        self.controls = controls
 
     def handle_input(self):
-        pygame.event.pump()
-        keys = pygame.key.get_pressed()
+        keys = self.controls
         # Виправлена інверсія
-        dx = int(keys[pygame.K_RIGHT]) - int(keys[pygame.K_LEFT])
-        dy = int(keys[pygame.K_DOWN])  - int(keys[pygame.K_UP])
+        dx = int(keys.is_held(pygame.K_RIGHT)) - int(keys.is_held(pygame.K_LEFT))
+        dy = int(keys.is_held(pygame.K_DOWN))  - int(keys.is_held(pygame.K_UP))
         self.direction.x = dx
         self.direction.y = dy
         if self.direction.length_squared():
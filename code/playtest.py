@@ -0,0 +1,240 @@
+# playtest.py
+"""
+Headless-прогон карт: несколько экземпляров Game в пуле процессов под
+SDL dummy-драйвером. Каждый прогон обходит карту по данным достижимости
+(Game.reachable), собирает наклейки, проверяет двери и точки спавна.
+
+Запуск из каталога code/:
+    python playtest.py                  # все карты из data/maps
+    python playtest.py corridor.tmx -r 8 -w 4
+"""
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from settings import MAPS_DIR, STICKERS_DIR, TILE_SIZE, FPS
+
+# Шаг симуляции такой же, как в Game.run при стабильном FPS
+SIM_DT = (1000 / FPS) / 600
+# Предел кадров на один переход к цели (защита от зацикливания)
+MAX_FRAMES_PER_GOAL = 5000
+
+NEIGHBOURS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+
+@dataclass
+class MapReport:
+    """Результат одного прогона карты."""
+    map_name: str
+    reachable_cells: int = 0
+    frames: int = 0
+    # Время, проведённое в Game.update (без запуска пула и загрузки карт)
+    seconds: float = 0.0
+    stickers_found: list[str] = field(default_factory=list)
+    stickers_collected: list[str] = field(default_factory=list)
+    problems: list[str] = field(default_factory=list)
+
+
+def _init_worker():
+    """Инициализация процесса пула: безоконный видео- и аудио-драйвер."""
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+
+def _cells_of(rect) -> set[tuple[int, int]]:
+    """Все клетки сетки, которые перекрывает rect."""
+    return {
+        (tx, ty)
+        for tx in range(rect.left // TILE_SIZE, (rect.right - 1) // TILE_SIZE + 1)
+        for ty in range(rect.top // TILE_SIZE, (rect.bottom - 1) // TILE_SIZE + 1)
+    }
+
+
+def _find_path(reachable, start, goals) -> list[tuple[int, int]] | None:
+    """BFS по достижимым клеткам от start до ближайшей клетки из goals."""
+    if start in goals:
+        return [start]
+    came_from = {start: None}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        for dx, dy in NEIGHBOURS:
+            nb = (cell[0] + dx, cell[1] + dy)
+            if nb in reachable and nb not in came_from:
+                came_from[nb] = cell
+                if nb in goals:
+                    path = [nb]
+                    while came_from[path[-1]] is not None:
+                        path.append(came_from[path[-1]])
+                    return path[::-1]
+                queue.append(nb)
+    return None
+
+
+def _step(game, report: MapReport) -> None:
+    """Один симулированный кадр; время Game.update идёт в report.seconds."""
+    start = time.perf_counter()
+    game.update(SIM_DT)
+    report.seconds += time.perf_counter() - start
+    report.frames += 1
+
+
+def _walk(game, path, report: MapReport) -> None:
+    """Ведёт игрока по центрам клеток path, выполняя Game.update каждый кадр."""
+    import pygame
+
+    player = game.player
+    step = player.speed * SIM_DT
+    frames = 0
+    for tx, ty in path:
+        target = pygame.Vector2((tx + 0.5) * TILE_SIZE, (ty + 0.5) * TILE_SIZE)
+        while frames < MAX_FRAMES_PER_GOAL:
+            pos = pygame.Vector2(player.hitbox_rect.center)
+            if pos.distance_to(target) <= step:
+                player.hitbox_rect.center = target
+                player.rect.center = player.hitbox_rect.center
+                break
+            pos.move_towards_ip(target, step)
+            player.hitbox_rect.center = pos
+            player.rect.center = player.hitbox_rect.center
+            _step(game, report)
+            frames += 1
+    _step(game, report)
+
+
+def _check_doors(game, map_name, report: MapReport) -> None:
+    """Двери: цель существует, дверь достижима, спавн не в коллизии и достижим."""
+    import pygame
+
+    doors = [
+        (door.rect.copy(), door.target_map, door.spawn_pos)
+        for door in game.door_sprites
+    ]
+    for rect, target, spawn in doors:
+        label = f"door at ({rect.x}, {rect.y})"
+        if not _cells_of(rect) & game.reachable:
+            report.problems.append(f"{label} is not reachable")
+        if not target:
+            report.problems.append(f"{label} has no target")
+            continue
+        if not (MAPS_DIR / target).exists():
+            report.problems.append(f"{label} targets missing map {target}")
+            continue
+        try:
+            game.change_level(target, spawn)
+        except Exception as exc:
+            report.problems.append(f"{label} -> {target}: failed to load ({exc})")
+            continue
+        if pygame.sprite.spritecollideany(
+            game.player,
+            game.collision_sprites,
+            collided=lambda p, c: p.hitbox_rect.colliderect(c.rect)
+        ):
+            report.problems.append(f"{label} -> {target}: spawn {spawn} is inside a collider")
+        spawn_cell = (
+            game.player.rect.centerx // TILE_SIZE,
+            game.player.rect.centery // TILE_SIZE
+        )
+        if spawn_cell not in game.reachable:
+            report.problems.append(f"{label} -> {target}: spawn {spawn} is not reachable")
+        game.change_level(map_name, None)
+
+
+def run_map(map_name: str) -> MapReport:
+    """Один headless-прогон карты map_name (выполняется в процессе пула)."""
+    from main import Game
+
+    report = MapReport(map_name)
+    game = Game(headless=True)
+    try:
+        game.change_level(map_name, None)
+    except Exception as exc:
+        report.problems.append(f"failed to load: {exc!r}")
+        return report
+    report.reachable_cells = len(game.reachable)
+
+    # Наклейки: достижимы ли их клетки и собираются ли они на самом деле
+    items = list(game.item_sprites)
+    report.stickers_found = sorted(item.id for item in items)
+    for item in items:
+        goals = _cells_of(item.rect) & game.reachable
+        if not goals:
+            report.problems.append(f"sticker {item.id} at {item.rect.topleft} is not reachable")
+            continue
+        player_cell = (
+            game.player.rect.centerx // TILE_SIZE,
+            game.player.rect.centery // TILE_SIZE
+        )
+        path = _find_path(game.reachable, player_cell, goals)
+        if path is None:
+            report.problems.append(f"sticker {item.id}: no path from player")
+            continue
+        _walk(game, path, report)
+        if item.alive():
+            report.problems.append(f"sticker {item.id}: reached but not picked up")
+        else:
+            report.stickers_collected.append(item.id)
+
+    _check_doors(game, map_name, report)
+    return report
+
+
+def _throughput(reports: list[MapReport]) -> str:
+    """Симулированные кадры и кадров/с по времени, проведённому в Game.update."""
+    frames = sum(r.frames for r in reports)
+    seconds = sum(r.seconds for r in reports)
+    rate = f"{frames / seconds:.0f} frames/s" if seconds else "n/a"
+    return f"{frames} simulated frames in {seconds:.2f} s of update, {rate}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless map coverage playtest")
+    parser.add_argument('maps', nargs='*', help="TMX files in data/maps (default: all)")
+    parser.add_argument('-r', '--repeat', type=int, default=1,
+                        help="instances per map (throughput runs)")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                        help="process pool size (default: all cores)")
+    args = parser.parse_args()
+
+    maps = args.maps or sorted(p.name for p in MAPS_DIR.glob('*.tmx'))
+    jobs = [name for name in maps for _ in range(args.repeat)]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+        reports = list(pool.map(run_map, jobs))
+    wall = time.perf_counter() - start
+
+    # Отчёт по каждой карте (повторные прогоны дают одинаковый результат,
+    # скорость симуляции усредняется по всем прогонам карты)
+    seen = set()
+    failed = False
+    all_stickers = set()
+    for report in reports:
+        all_stickers.update(report.stickers_collected)
+        if report.map_name in seen:
+            continue
+        seen.add(report.map_name)
+        runs = [r for r in reports if r.map_name == report.map_name]
+        print(f"{report.map_name}: {report.reachable_cells} reachable cells, "
+              f"stickers {len(report.stickers_collected)}/{len(report.stickers_found)} collected, "
+              f"{_throughput(runs)}")
+        for problem in report.problems:
+            print(f"  ! {problem}")
+        failed |= bool(report.problems)
+
+    expected = {p.stem for p in STICKERS_DIR.glob('*.png')}
+    missing = sorted(expected - all_stickers)
+    if missing:
+        print(f"stickers never collected: {', '.join(missing)}")
+        failed = True
+
+    print(f"{len(jobs)} runs on {args.workers} workers in {wall:.2f} s, "
+          f"{_throughput(reports)}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+# quality.py
+import logging
+from collections import deque
+from dataclasses import dataclass
+
+from settings import FPS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """Набор настроек качества; уровни упорядочены от лучшего к самому дешёвому."""
+    name: str
+    render_scale: float     # CameraGroup.render_scale
+    lighting_scale: float   # разрешение overlay LightingLayer
+    particle_scale: float   # ParticleSystem.emit_scale
+    banner_fades: bool      # плавное затухание баннеров
+
+
+# render_scale * CHUNK_SIZE * zoom должно давать целое число пикселей
+QUALITY_LEVELS = (
+    QualityLevel('high', 1.0, 1.0, 1.0, True),
+    QualityLevel('medium', 1.0, 1.0, 0.5, False),
+    QualityLevel('low', 0.75, 0.75, 0.5, False),
+    QualityLevel('lower', 0.75, 0.75, 0.25, False),
+    QualityLevel('lowest', 0.5, 0.5, 0.1, False),
+)
+
+
+@dataclass(frozen=True)
+class QualityDecision:
+    """Запись о смене уровня: для логов и отладки."""
+    frame: int
+    old: str
+    new: str
+    p95_ms: float
+    reason: str
+
+
+class QualityGovernor:
+    """
+    Следит за временем кадров и меняет уровень качества.
+
+    1. Время работы кадра (без ожидания clock.tick) копится в окне WINDOW кадров.
+    2. Раз в EVALUATE_EVERY кадров считается 95-й перцентиль.
+    3. p95 выше бюджета кадра — уровень понижается сразу.
+    4. p95 ниже UPGRADE_HEADROOM * бюджет UPGRADE_STREAK проверок подряд — уровень повышается,
+       но только если прогноз p95 на лучшем уровне укладывается в бюджет. Прогноз —
+       текущий p95, умноженный на отношение стоимости уровней, замеренное при
+       последнем понижении: p95 до понижения / первый p95 после него. При плохом
+       прогнозе уровень пробуется только через PROBE_FACTOR обычных порогов.
+    5. Повышение, откатанное на первой же проверке, удваивает число проверок,
+       нужных для повторного повышения на этот уровень (не больше MAX_UPGRADE_STREAK).
+    6. После любой смены окно очищается, чтобы мерить уже новый уровень.
+    """
+    WINDOW = 120
+    EVALUATE_EVERY = 30
+    DOWNGRADE_AT = 1.0
+    UPGRADE_HEADROOM = 0.6
+    UPGRADE_STREAK = 4
+    MAX_UPGRADE_STREAK = 256
+    PROBE_FACTOR = 8
+
+    def __init__(self, levels=QUALITY_LEVELS, fps: int = FPS):
+        self.levels = levels
+        self.index = 0
+        self.budget_ms = 1000 / fps
+        self.samples: deque[float] = deque(maxlen=self.WINDOW)
+        self.frame = 0
+        self.headroom_streak = 0
+        # Проверок подряд, нужных для повышения на уровень index (растёт после откатов)
+        self.upgrade_streak = [self.UPGRADE_STREAK] * len(levels)
+        # Во сколько раз уровень index дороже index + 1 (по последнему понижению)
+        self.cost_ratio: dict[int, float] = {}
+        # Уровень и p95, с которых понизились, пока нет первого замера на новом уровне
+        self._left: tuple[int, float] | None = None
+        # Уровень только что повышен и ещё не прошёл первую проверку
+        self._on_probation = False
+        self.decisions: list[QualityDecision] = []
+
+    @property
+    def level(self) -> QualityLevel:
+        return self.levels[self.index]
+
+    def percentile(self, q: float) -> float:
+        """q-й перцентиль (0..100) времени кадра в окне, мс."""
+        ordered = sorted(self.samples)
+        return ordered[min(int(len(ordered) * q / 100), len(ordered) - 1)]
+
+    def record(self, frame_ms: float) -> QualityLevel | None:
+        """Добавить время кадра; вернуть новый уровень, если его нужно применить."""
+        self.frame += 1
+        self.samples.append(frame_ms)
+        if len(self.samples) < self.WINDOW or self.frame % self.EVALUATE_EVERY:
+            return None
+
+        p95 = self.percentile(95)
+        if self._left is not None:
+            left, left_p95 = self._left
+            self.cost_ratio[left] = left_p95 / max(p95, 1e-3)
+            self._left = None
+        reverted, self._on_probation = self._on_probation, False
+
+        if p95 > self.budget_ms * self.DOWNGRADE_AT and self.index < len(self.levels) - 1:
+            return self._downgrade(p95, reverted)
+        if p95 < self.budget_ms * self.UPGRADE_HEADROOM and self.index > 0:
+            self.headroom_streak += 1
+            required = self.upgrade_streak[self.index - 1]
+            predicted = self.predict_p95(self.index - 1, p95)
+            if self.headroom_streak >= required and predicted <= self.budget_ms * self.DOWNGRADE_AT:
+                return self._change(self.index - 1, p95, f"headroom, predicted p95 {predicted:.1f} ms")
+            # Отношение стоимости могло устареть вместе со сценой: после PROBE_FACTOR
+            # обычных порогов уровень всё же пробуется, откат удвоит и этот срок
+            if self.headroom_streak >= required * self.PROBE_FACTOR:
+                return self._change(self.index - 1, p95, f"probe, predicted p95 {predicted:.1f} ms")
+        else:
+            self.headroom_streak = 0
+        return None
+
+    def predict_p95(self, index: int, p95: float) -> float:
+        """Ожидаемый p95 на соседнем лучшем уровне index при текущем p95, мс."""
+        return p95 * self.cost_ratio.get(index, 1.0)
+
+    def _downgrade(self, p95: float, reverted: bool) -> QualityLevel:
+        """Понизить уровень; если это откат только что сделанного повышения — удвоить его порог."""
+        reason = "over budget"
+        if reverted:
+            self.upgrade_streak[self.index] = min(
+                self.upgrade_streak[self.index] * 2, self.MAX_UPGRADE_STREAK
+            )
+            reason = f"upgrade reverted, next upgrade after {self.upgrade_streak[self.index]} checks"
+        self._left = (self.index, p95)
+        return self._change(self.index + 1, p95, reason)
+
+    def _change(self, index: int, p95: float, reason: str) -> QualityLevel:
+        decision = QualityDecision(self.frame, self.level.name, self.levels[index].name, p95, reason)
+        self.decisions.append(decision)
+        logger.info("quality %s -> %s (p95 %.1f ms, %s)", decision.old, decision.new, p95, reason)
+        self._on_probation = index < self.index
+        self.index = index
+        self.samples.clear()
+        self.headroom_streak = 0
+        return self.level
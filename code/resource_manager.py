@@ -1,16 +1,32 @@
+from collections import OrderedDict
 from pathlib import Path
 import pygame
 from pytmx import pytmx
-from settings import PARENT_DIR
-from typing import Dict, Union
-from pytmx.util_pygame import load_pygame
+from settings import PARENT_DIR, SURFACE_CACHE_SIZE
+from typing import Dict, Optional, Set, Tuple, Union
+from pytmx.util_pygame import handle_transformation, smart_convert
+
+
+# Джерело для похідних Surface: шлях до зображення або вже готовий Surface
+ImageSource = Union[str, Path, pygame.Surface]
+# Ключ похідного Surface: (джерело, розмір, кут, сірий, альфа)
+VariantKey = Tuple[object, Optional[Tuple[int, int]], float, bool, Optional[int]]
+# Ключ тайла: (зображення тайлсету, rect у ньому, прапорці повороту, colorkey)
+TileKey = Tuple[Path, Optional[Tuple[int, int, int, int]], object, Optional[str]]
 
 
 class ResourceManager:
     # Словник для кешування завантажених Surface
     _images: Dict[Path, pygame.Surface] = {}
+    # Лічильники acquire_image; зображення з load_image закріплені в кеші назавжди
+    _image_refs: Dict[Path, int] = {}
+    _pinned_images: Set[Path] = set()
     # Словник для кешування TMX-карт
     _tmx_data: Dict[Path, pytmx.TiledMap] = {}
+    # Нарізані та конвертовані тайли, спільні для всіх карт
+    _tiles: Dict[TileKey, pygame.Surface] = {}
+    # LRU-кеш похідних Surface (scale / rotate / grayscale / alpha)
+    _variants: "OrderedDict[VariantKey, pygame.Surface]" = OrderedDict()
 
     @classmethod
     def load_image(cls, rel_path: Union[str, Path]) -> pygame.Surface:
@@ -19,21 +35,155 @@ class ResourceManager:
         2. Якщо зображення ще не завантажено, завантажує через pygame.image.load, виконує convert_alpha().
         3. Зберігає Surface у кеш (_images) за ключем Path.
         4. Повертає Surface із кешу.
+        5. Зображення закріплюється: release_image його вже не прибирає.
         """
-        path = PARENT_DIR / rel_path
-        path = Path(path)
+        path = Path(PARENT_DIR / rel_path)
+        cls._pinned_images.add(path)
+        return cls._load(path)
+
+    @classmethod
+    def acquire_image(cls, rel_path: Union[str, Path]) -> pygame.Surface:
+        """Як load_image, але з лічильником: кожен виклик потребує пари release_image."""
+        path = Path(PARENT_DIR / rel_path)
+        cls._image_refs[path] = cls._image_refs.get(path, 0) + 1
+        return cls._load(path)
+
+    @classmethod
+    def release_image(cls, rel_path: Union[str, Path]) -> None:
+        """
+        Відпускає зображення, отримане через acquire_image (наприклад, коли сторінка
+        інвентаря більше не потрібна). З кешу воно прибирається, лише коли його
+        більше ніхто не тримає і його не завантажували через load_image.
+        """
+        path = Path(PARENT_DIR / rel_path)
+        refs = cls._image_refs.get(path, 0) - 1
+        if refs > 0:
+            cls._image_refs[path] = refs
+            return
+        cls._image_refs.pop(path, None)
+        if path not in cls._pinned_images:
+            cls._images.pop(path, None)
+
+    @classmethod
+    def _load(cls, path: Path) -> pygame.Surface:
         if path not in cls._images:
             cls._images[path] = pygame.image.load(path).convert_alpha()
         return cls._images[path]
 
+    @classmethod
+    def get_variant(
+        cls,
+        source: ImageSource,
+        size: Optional[Tuple[float, float]] = None,
+        angle: float = 0,
+        grayscale: bool = False,
+        alpha: Optional[int] = None,
+    ) -> pygame.Surface:
+        """
+        1. Приймає шлях (як у load_image) або Surface і параметри перетворення.
+        2. Порядок перетворень: scale -> grayscale -> rotate -> alpha.
+           Кожен проміжний крок теж кешується, тож різні кути одного
+           масштабованого зображення масштабуються лише один раз.
+        3. Результат зберігається у _variants; при переповненні витісняється
+           найдавніше використаний запис (SURFACE_CACHE_SIZE).
+        4. Повернутий Surface спільний — не змінюйте його (для зміни альфи
+           чи пікселів робіть власну .copy()).
+        """
+        base = cls._resolve_source(source)
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+        angle = angle % 360
+        key = (base, size, angle, grayscale, alpha)
+
+        cached = cls._variants.get(key)
+        if cached is not None:
+            cls._variants.move_to_end(key)
+            return cached
+
+        if alpha is not None:
+            surf = cls.get_variant(base, size, angle, grayscale).copy()
+            surf.set_alpha(alpha)
+        elif angle:
+            surf = pygame.transform.rotate(cls.get_variant(base, size, 0, grayscale), angle)
+        elif grayscale:
+            surf = cls._make_grayscale(cls.get_variant(base, size))
+        elif size is not None:
+            surf = pygame.transform.scale(base, size)
+        else:
+            # Без перетворень — це і є оригінал
+            return base
+
+        cls._variants[key] = surf
+        while len(cls._variants) > SURFACE_CACHE_SIZE:
+            cls._variants.popitem(last=False)
+        return surf
+
+    @classmethod
+    def _resolve_source(cls, source: ImageSource) -> pygame.Surface:
+        """Повертає базовий Surface: сам Surface або завантажений за шляхом."""
+        if isinstance(source, pygame.Surface):
+            return source
+        return cls.load_image(source)
+
+    @staticmethod
+    def _make_grayscale(image: pygame.Surface) -> pygame.Surface:
+        """Сіра копія зображення (яскравість 0.3/0.59/0.11) зі збереженням альфа-каналу."""
+        import numpy as np
+        import pygame.surfarray as surfarray
+
+        arr = surfarray.array3d(image)
+        lum = (
+            arr[:, :, 0] * 0.3 +
+            arr[:, :, 1] * 0.59 +
+            arr[:, :, 2] * 0.11
+        ).astype(np.uint8)
+        gray = surfarray.make_surface(np.stack((lum,) * 3, axis=2)).convert_alpha()
+        if image.get_flags() & pygame.SRCALPHA:
+            gray_alpha = surfarray.pixels_alpha(gray)
+            gray_alpha[...] = surfarray.array_alpha(image)
+            del gray_alpha  # знімаємо блокування Surface
+        return gray
+
     @classmethod
     def load_tmx(cls, rel_path: Union[str, Path]) -> pytmx.TiledMap:
         """
-        1. Завантажує та кешує TMX-картку через pytmx.util_pygame.load_pygame.
-        2. Повторний виклик повертає вже завантажену копію.
+        1. Завантажує та кешує TMX-картку через pytmx.TiledMap зі спільним завантажувачем тайлів.
+        2. pytmx запитує лише ті gid, які використовує карта; тайли беруться з _tiles,
+           тож кілька карт з одним тайлсетом ділять ті самі Surface.
+        3. Повторний виклик повертає вже завантажену копію.
         """
         path = PARENT_DIR / rel_path
         path = Path(path)
         if path not in cls._tmx_data:
-            cls._tmx_data[path] = load_pygame(path)
+            cls._tmx_data[path] = pytmx.TiledMap(str(path), image_loader=cls._tile_loader)
         return cls._tmx_data[path]
+
+    @classmethod
+    def _tile_loader(cls, filename: str, colorkey: Optional[str], **kwargs):
+        """
+        Завантажувач зображень для pytmx (замість pytmx.util_pygame.pygame_image_loader).
+        1. Нічого не декодує одразу — лише повертає функцію нарізки.
+        2. Тайл шукається в _tiles; зображення тайлсету декодується не більше одного
+           разу, коли вперше потрібен тайл, якого ще немає в кеші.
+        3. Зображення тайлсету живе лише в замиканні: pytmx відкидає завантажувач
+           після побудови карти, і в пам'яті лишаються тільки нарізані тайли.
+        """
+        path = Path(filename).resolve()
+        pixelalpha = kwargs.get('pixelalpha', True)
+        sheet = None
+
+        def load_tile(rect=None, flags=None):
+            nonlocal sheet
+            key = (path, tuple(rect) if rect else None, flags or None, colorkey)
+            tile = cls._tiles.get(key)
+            if tile is None:
+                if sheet is None:
+                    sheet = pygame.image.load(path)
+                tile = sheet.subsurface(rect) if rect else sheet.copy()
+                if flags:
+                    tile = handle_transformation(tile, flags)
+                tile = smart_convert(tile, pygame.Color(f'#{colorkey}') if colorkey else None, pixelalpha)
+                cls._tiles[key] = tile
+            return tile
+
+        return load_tile
@@ -16,13 +16,18 @@ class RoomNotifier:
         self.start_time = 0
         self.image = None
         self.rect = None
+        # Плавное затухание (QualityGovernor может отключить)
+        self.fade = True
+        # Собственные копии баннеров по комнатам: альфу меняем только у них
+        self.banners = {}
 
     def show(self, room_name: str):
         """Запустить показ баннера для комнаты room_name."""
         banner_path = UI_DIR / f"{room_name}_banner.png"
-        # загружаем с альфа-каналом
-        img = ResourceManager.load_image(banner_path)
-        self.image = img.convert_alpha()
+        # своя копия баннера (один раз на комнату): альфа меняется при фейде
+        if room_name not in self.banners:
+            self.banners[room_name] = ResourceManager.load_image(banner_path).copy()
+        self.image = self.banners[room_name]
         # сразу полная непрозрачность
         self.image.set_alpha(255)
         # позиционируем
@@ -39,7 +44,7 @@ class RoomNotifier:
         if elapsed >= self.DISPLAY_TIME:
             # Полностью скрываем баннер по истечении общего времени
             self.active = False
-        elif elapsed > self.FADE_DELAY:
+        elif self.fade and elapsed > self.FADE_DELAY:
             # Начинаем фейд
             fade_elapsed = elapsed - self.FADE_DELAY
             # alpha от 255 → 0 за FADE_TIME
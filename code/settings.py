@@ -10,6 +10,24 @@ FPS = 60
 ANIMATION_SPEED = 5
 PICKUP_RADIUS = 100
 
+# max number of derived (scaled/rotated/gray) surfaces kept in ResourceManager
+SURFACE_CACHE_SIZE = 256
+
+# lighting / fog of war, in tiles
+FOG_RADIUS = 4
+PLAYER_LIGHT_RADIUS = 3
+
+# max number of live particles (preallocated)
+PARTICLE_CAPACITY = 4096
+
+# camera zoom levels; CHUNK_SIZE * level should be a whole number
+ZOOM_LEVELS = (0.5, 0.75, 1.0, 1.5, 2.0)
+# world chunk size for cached ground rendering (px at 1:1)
+CHUNK_SIZE = 512
+# pixel budget over all zoom levels, for each of: cached ground chunks and
+# the current room's zoomed lighting chunks
+CHUNK_CACHE_PIXELS = 16 * 1024 * 1024
+
 # Paths
 # Parent path
 PARENT_DIR = Path(__file__).parent.parent
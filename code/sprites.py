@@ -13,6 +13,9 @@ from resource_manager import *
 
 class WorldSprite(pygame.sprite.Sprite):
     def __init__(self, pos, image_source, groups, ground=False):
+        # ground задаємо до додавання в групи: CameraGroup кешує фон по чанках
+        if ground:
+            self.ground = True
         super().__init__(groups)
         # Якщо передано вже Surface (наприклад, із TMX), використовуємо його напряму
         if isinstance(image_source, pygame.Surface):
@@ -21,5 +24,3 @@ class WorldSprite(pygame.sprite.Sprite):
             # Інакше підвантажуємо за шляхом через ResourceManager
             self.image = ResourceManager.load_image(image_source)
         self.rect = self.image.get_rect(topleft=pos)
-        if ground:
-            self.ground = True